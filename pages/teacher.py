@@ -9,9 +9,22 @@
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+
+# orjson이 설치되어 있으면 Figure JSON 직렬화에 사용 (기본 json 대비 수 배 빠름)
+try:
+    pio.json.config.default_engine = "orjson"
+except (ImportError, ValueError):
+    pass
 from supabase import create_client, Client
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import time
+
+KST = ZoneInfo("Asia/Seoul")
 
 # UI 레이아웃
 st.set_page_config(page_title="교사용 대시보드", layout="wide") 
@@ -22,6 +35,9 @@ if password != "2314":  # 원하는 비밀번호로 변경하세요
     st.warning("선생님만 접근할 수 있습니다.")
     st.stop()  # 암호가 틀리면 여기서 코드 실행 중단
 
+# 조회 행 수 상한 (데이터가 늘어나도 응답 크기를 제어)
+max_rows = st.sidebar.number_input("최대 조회 행 수", min_value=100, max_value=10000, value=1000, step=100)
+
 # =========================================================
 # 1) Supabase 연결 (MySQL의 init_db() 대응)
 # =========================================================
@@ -31,43 +47,166 @@ def get_supabase_client() -> Client:
     key = st.secrets["SUPABASE_SERVICE_ROLE_KEY"]  # 교사용 로컬 대시보드: 서버/로컬에만 보관
     return create_client(url, key)
 
+# =========================================================
+# 1-1) 직접 Postgres 연결 (선택) — PostgREST HTTPS+JSON 왕복을 우회
+#      st.secrets에 SUPABASE_DB_URL(대시보드의 pgbouncer 풀러 연결 문자열)을
+#      넣어두면 조회가 지속 TCP 연결 + 바이너리 프로토콜로 수행됩니다.
+# =========================================================
+# 캐시된 연결이 닫혔으면 validate가 False를 반환해 새로 연결한다
+@st.cache_resource(validate=lambda conn: conn is None or not conn.closed)
+def get_db_conn():
+    """pgbouncer 경유 지속 연결. URL 미설정/psycopg 미설치면 None(PostgREST 폴백).
+
+    autocommit으로 연결해 SELECT마다 트랜잭션이 열린 채 남지 않도록 한다
+    (idle-in-transaction으로 풀러 연결이 고정·강제 종료되는 것을 방지).
+    """
+    if "SUPABASE_DB_URL" not in st.secrets:
+        return None
+    try:
+        import psycopg
+    except ImportError:
+        return None
+    return psycopg.connect(st.secrets["SUPABASE_DB_URL"], autocommit=True)
+
+def drop_db_conn(conn) -> None:
+    """깨진 연결을 닫고 캐시에서 제거 — 다음 리런에서 재연결."""
+    try:
+        conn.close()
+    except Exception:
+        pass
+    get_db_conn.clear()
+
 # =========================================================
 # 2) 데이터 로드 (MySQL의 fetch_data(query, params) 대응)
 #    - Supabase는 SQL 문자열 대신 "쿼리 빌더 체이닝" 사용
 # =========================================================
-@st.cache_data(show_spinner=False, ttl=30)
-def fetch_data(search_id: str, days: int) -> pd.DataFrame:
+# 조회 스키마는 고정이므로 컬럼 목록을 상수로 둔다
+TABLE_COLUMNS = (
+    "id", "student_id", "answer_1", "answer_2", "answer_3",
+    "feedback_1", "feedback_2", "feedback_3", "model", "created_at",
+)
+
+def rows_to_frame(rows: list) -> pd.DataFrame:
+    """REST 응답(list of dict)을 컬럼 단위 dict로 재배열해 DataFrame 생성.
+
+    pd.DataFrame(rows)의 행 단위 타입 추론을 건너뛰고
+    컬럼당 한 번의 연속 할당으로 만들어 큰 응답에서 빠르다.
+    """
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame({k: [row.get(k) for row in rows] for k in TABLE_COLUMNS})
+
+@st.cache_data(show_spinner=False, ttl=10)
+def get_watermark() -> tuple:
+    """테이블의 (전체 건수, 최신 id)만 조회 — 본 조회 캐시의 무효화 키로 사용."""
+    conn = get_db_conn()
     try:
-        supabase = get_supabase_client()
+        if conn is not None:
+            # 직접 연결이 있으면 워터마크도 HTTPS 왕복 없이 조회
+            row = conn.execute(
+                "SELECT count(*), "
+                "(SELECT id FROM student_submissions"
+                " ORDER BY created_at DESC LIMIT 1) "
+                "FROM student_submissions"
+            ).fetchone()
+            return (row[0], row[1])
 
-        # 컬럼 선택: 필요시 guideline_1~3, model도 추가 가능
-        q = (
+        supabase = get_supabase_client()
+        res = (
             supabase.table("student_submissions")
-            .select(
-                "id, student_id, answer_1, answer_2, answer_3, "
-                "feedback_1, feedback_2, feedback_3, model, created_at"
-            )
+            .select("id", count="exact")
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
         )
+        latest_id = res.data[0]["id"] if res.data else None
+        return (res.count, latest_id)
+    except Exception:
+        if conn is not None:
+            drop_db_conn(conn)
+        # 상수 키를 돌려주면 장애 중 조회 결과가 본 조회 ttl 내내 그 키로
+        # 캐시되므로, 30초 시간 버킷을 키로 써서 신선도 하한을 유지
+        return ("error", int(time.time() // 30))
 
-        # 학번 부분 검색 (대소문자 무시 검색)
-        if search_id:
-            q = q.ilike("student_id", f"%{search_id}%")
+def fetch_data(search_id: str, days: int, limit: int) -> pd.DataFrame:
+    """워터마크가 바뀌었을 때만 전체 조회를 다시 실행하는 래퍼."""
+    return _fetch_data(get_watermark(), search_id, days, limit)
 
-        # 최근 N일 필터 (created_at 기준)
-        if days and days > 0:
-            date_from = datetime.now(timezone.utc) - timedelta(days=int(days))
-            q = q.gte("created_at", date_from.isoformat())
+# watermark는 본문에서 쓰지 않지만 캐시 키에 포함시키기 위한 인자
+@st.cache_data(show_spinner=False, ttl=600)
+def _fetch_data(watermark: tuple, search_id: str, days: int, limit: int) -> pd.DataFrame:
+    try:
+        # 공통 필터 값 준비
+        # %, _ 는 LIKE 와일드카드이므로 이스케이프해 문자 그대로 검색
+        escaped = (
+            search_id.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            if search_id
+            else ""
+        )
+        date_from = (
+            datetime.now(timezone.utc) - timedelta(days=int(days))
+            if days and days > 0
+            else None
+        )
 
-        # 최신순 정렬
-        q = q.order("created_at", desc=True)
+        conn = get_db_conn()
+        if conn is not None:
+            # 직접 SQL 경로 — 지속 연결 + 바이너리 전송으로 HTTPS/JSON 비용 제거
+            sql = "SELECT " + ", ".join(TABLE_COLUMNS) + " FROM student_submissions"
+            where, params = [], []
+            if escaped:
+                where.append("student_id ILIKE %s")
+                params.append(f"%{escaped}%")
+            if date_from is not None:
+                where.append("created_at >= %s")
+                params.append(date_from)
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY created_at DESC LIMIT %s"
+            params.append(int(limit))
+            try:
+                df = pd.read_sql(sql, conn, params=params)
+            except Exception:
+                # 연결이 죽었을 수 있으므로 버리고 재연결하게 한 뒤 공통 처리로
+                drop_db_conn(conn)
+                raise
+        else:
+            # PostgREST 경로 (기존 쿼리 빌더)
+            supabase = get_supabase_client()
 
-        res = q.execute()
-        rows = res.data or []
-        df = pd.DataFrame(rows)
+            # 컬럼 선택: 필요시 guideline_1~3, model도 추가 가능
+            q = (
+                supabase.table("student_submissions")
+                .select(
+                    "id, student_id, answer_1, answer_2, answer_3, "
+                    "feedback_1, feedback_2, feedback_3, model, created_at"
+                )
+            )
+
+            # 학번 부분 검색 (대소문자 무시, DB에서 필터링)
+            if escaped:
+                q = q.ilike("student_id", f"%{escaped}%")
+
+            # 최근 N일 필터 (created_at 기준)
+            if date_from is not None:
+                q = q.gte("created_at", date_from.isoformat())
+
+            # 최신순 정렬 + 행 수 제한 (데이터가 쌓여도 전송량 상한 유지)
+            q = q.order("created_at", desc=True).limit(limit)
+
+            res = q.execute()
+            df = rows_to_frame(res.data or [])
 
-        # created_at을 datetime으로 변환(통계/정렬에 유용)
+        # created_at을 KST 기준 datetime64로 일괄 변환 — 문자열 포맷팅은
+        # 화면에 그릴 때만 하므로 여기서는 tz-aware 타입 그대로 유지
         if not df.empty and "created_at" in df.columns:
-            df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
+            df["created_at"] = pd.to_datetime(
+                df["created_at"], utc=True, errors="coerce"
+            ).dt.tz_convert(KST)
+
+        # 학번은 고유값이 적으므로 카테고리형으로 — 비교/unique 연산과 메모리 절약
+        if not df.empty and "student_id" in df.columns:
+            df["student_id"] = df["student_id"].astype("category")
 
         return df
 
@@ -92,15 +231,165 @@ def fetch_student_history(student_id: str, limit: int = 200) -> pd.DataFrame:
             .limit(limit)
         )
         res = q.execute()
-        rows = res.data or []
-        df = pd.DataFrame(rows)
+        df = rows_to_frame(res.data or [])
         if not df.empty and "created_at" in df.columns:
-            df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
+            df["created_at"] = pd.to_datetime(
+                df["created_at"], utc=True, errors="coerce"
+            ).dt.tz_convert(KST)
         return df
     except Exception as e:
         st.error(f"개인 이력 조회 오류: {e}")
         return pd.DataFrame()
 
+# =========================================================
+# 2-0) 상단 통계 서버 집계 (행 전체 대신 숫자 몇 개만 전송)
+#      Supabase SQL Editor에서 아래 함수를 1회 생성해 두면 사용됩니다.
+#      미생성 시 None을 반환하고 행 기반 계산으로 폴백합니다.
+#
+#      create or replace function get_dashboard_stats(days_back int default 0)
+#      returns table (
+#        total bigint, students bigint, latest timestamptz,
+#        q1_rate numeric, q2_rate numeric, q3_rate numeric,
+#        avg_total numeric, perfect bigint
+#      ) language sql stable as $$
+#        select count(*), count(distinct student_id), max(created_at),
+#               avg((feedback_1 ilike 'O%')::int) * 100,
+#               avg((feedback_2 ilike 'O%')::int) * 100,
+#               avg((feedback_3 ilike 'O%')::int) * 100,
+#               avg((feedback_1 ilike 'O%')::int + (feedback_2 ilike 'O%')::int
+#                   + (feedback_3 ilike 'O%')::int),
+#               count(*) filter (where feedback_1 ilike 'O%'
+#                 and feedback_2 ilike 'O%' and feedback_3 ilike 'O%')
+#        from student_submissions
+#        where days_back = 0
+#           or created_at >= now() - make_interval(days => days_back);
+#      $$;
+# =========================================================
+@st.cache_data(show_spinner=False, ttl=30)
+def fetch_stats(days: int) -> dict | None:
+    """상단 통계를 Postgres에서 집계해 받아온다(N행 × 7컬럼 대신 숫자 6개)."""
+    try:
+        supabase = get_supabase_client()
+        res = supabase.rpc("get_dashboard_stats", {"days_back": int(days)}).execute()
+        rows = res.data or []
+        return rows[0] if rows else None
+    except Exception:
+        # RPC 함수 미생성/권한 문제 등 — 행 기반 폴백 사용
+        return None
+
+# =========================================================
+# 2-1) 점수 계산 (feedback_i의 "O:"/"X:" 판정 → Q{i}_점수, 총점)
+#      - 순수 함수로 분리하고 cache_data로 감싸 리런마다 재계산하지 않음
+# =========================================================
+@st.cache_data(show_spinner=False)
+def process_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """feedback_1~3의 O/X 판정을 Q1~Q3 점수(0/1)와 총점 컬럼으로 변환해 반환."""
+    if df.empty:
+        return df
+    df = df.copy()
+    # 세 피드백 컬럼을 NumPy 2D 배열로 쌓아 한 번의 C 레벨 패스로 판정.
+    # 앞 2글자만 있으면 "O" 접두 여부를 알 수 있으므로 U2로 잘라 비교 비용 최소화.
+    fb_cols = ["feedback_1", "feedback_2", "feedback_3"]
+    fb = df[fb_cols].fillna("").to_numpy(dtype="U2")
+    mask = np.char.startswith(np.char.upper(np.char.strip(fb)), "O")
+    df[["Q1_점수", "Q2_점수", "Q3_점수"]] = mask.astype(np.int8)
+    df["총점"] = mask.sum(axis=1, dtype=np.int8)
+    return df
+
+# =========================================================
+# 2-1-0) CSV 변환 (인코딩이 비싸므로 데이터가 바뀔 때만 수행)
+# =========================================================
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+# =========================================================
+# 2-1-1) 통계 차트 (Figure 생성이 느리므로 입력값 기준으로 캐시)
+# =========================================================
+@st.cache_data(show_spinner=False)
+def build_accuracy_bar(q_rates: tuple, scope: str):
+    """문항별 O 비율 막대 그래프. 같은 비율이면 캐시된 Figure를 재사용."""
+    return px.bar(
+        x=["문항 1", "문항 2", "문항 3"],
+        y=list(q_rates),
+        labels={"x": "문항", "y": "O 비율(%)"},
+        range_y=[0, 100],
+        title=f"문항별 O 비율 ({scope})",
+    )
+
+@st.cache_data(show_spinner=False)
+def build_score_pie(score_counts: tuple):
+    """총점(0~3점) 분포 파이 차트. (점수, 건수) 튜플을 캐시 키로 사용."""
+    return px.pie(
+        names=[f"{score}점" for score, _ in score_counts],
+        values=[count for _, count in score_counts],
+        hole=0.3,
+        title="총점 분포 (표시 범위 기준)",
+    )
+
+# =========================================================
+# 2-1-2) 학번별 최신 제출 인덱스 (선택 시마다 전체 스캔하지 않도록 1회 구축)
+# =========================================================
+@st.cache_data(show_spinner=False)
+def latest_by_student(df: pd.DataFrame) -> pd.DataFrame:
+    """학번별 최신 제출 1건을 student_id 인덱스로 반환 — .loc O(1) 조회용."""
+    return (
+        df.sort_values("created_at")
+        .drop_duplicates("student_id", keep="last")
+        .set_index("student_id")
+    )
+
+# =========================================================
+# 2-2) 개인별 드릴다운 (fragment — selectbox 변경 시 이 블록만 리런)
+# =========================================================
+@st.fragment
+def render_student_detail(df: pd.DataFrame) -> None:
+    """특정 학번의 최신 제출 상세 + 제출 이력을 표시."""
+    # 현재 필터 범위 내 학생 목록에서 선택(원하면 직접 입력으로 바꿔도 됨)
+    # student_id는 카테고리형 — categories가 이미 정렬된 고유 목록이라 복사/정렬 불필요
+    student_list = df["student_id"].cat.categories.tolist()
+    selected = st.selectbox("학번 선택", options=student_list)
+    if not selected:
+        return
+
+    # 최신 제출의 문항별 답안/피드백 — 이미 받아온 df에서 해시 조회(O(1))
+    latest = latest_by_student(df).loc[selected]
+    for i, tab in enumerate(st.tabs(["문항 1", "문항 2", "문항 3"]), start=1):
+        with tab:
+            st.markdown("**답안**")
+            st.write(latest.get(f"answer_{i}") or "-")
+            fb = str(latest.get(f"feedback_{i}") or "")
+            if fb.startswith("O:"):
+                st.success(fb)
+            else:
+                st.info(fb or "-")
+
+    history = fetch_student_history(selected, limit=200)
+    st.write(f"**{selected} 제출 이력: {len(history)}건**")
+
+    if history.empty:
+        st.info("이 학번의 이력이 없습니다.")
+        return
+
+    hist_cols = [
+        "created_at",
+        "answer_1", "feedback_1",
+        "answer_2", "feedback_2",
+        "answer_3", "feedback_3",
+        "model",
+    ]
+    hist_cols = [c for c in hist_cols if c in history.columns]
+    st.dataframe(
+        history[hist_cols],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "created_at": st.column_config.DatetimeColumn(
+                "제출시간", format="YYYY-MM-DD HH:mm:ss"
+            )
+        },
+    )
+
 # =========================================================
 # 3) UI 레이아웃
 # =========================================================
@@ -115,7 +404,7 @@ with col3:
     if st.button("🔄 새로고침"):
         st.cache_data.clear()
 
-df = fetch_data(search_id=search_id.strip(), days=int(days))
+df = process_scores(fetch_data(search_id=search_id.strip(), days=int(days), limit=int(max_rows)))
 
 # =========================================================
 # 4) 상단 통계(전체/학생 수/문항별 O 비율)
@@ -125,31 +414,76 @@ st.write(f"**총 {len(df)} 건** 표시 중")
 if df.empty:
     st.info("조건에 해당하는 데이터가 없습니다.")
 else:
-    unique_students = df["student_id"].nunique() if "student_id" in df.columns else 0
-    latest_time = df["created_at"].max() if "created_at" in df.columns else None
+    # 행 기반 지표는 점수 행렬 1회 스캔으로 모두 도출 (개별 pandas 패스 제거)
+    score_matrix = df[["Q1_점수", "Q2_점수", "Q3_점수"]].to_numpy(np.int8)
+    totals = score_matrix.sum(axis=1)
+    score_counts = np.bincount(totals, minlength=4)  # 0~3점 분포
+
+    # 검색 필터가 없으면 DB 집계(RPC)로 통계 계산 — 행 제한(limit)과 무관하게 정확
+    stats = fetch_stats(int(days)) if not search_id.strip() else None
+
+    if stats:
+        total_count = int(stats.get("total") or 0)
+        unique_students = int(stats.get("students") or 0)
+        latest_time = pd.to_datetime(stats.get("latest"), utc=True, errors="coerce")
+        if pd.notna(latest_time):
+            latest_time = latest_time.tz_convert(KST)
+        r1 = float(stats.get("q1_rate") or 0.0)
+        r2 = float(stats.get("q2_rate") or 0.0)
+        r3 = float(stats.get("q3_rate") or 0.0)
+        rate_scope = "테이블 전체 기준"
+        # 확장된 RPC(평균 총점/만점 수 포함)라면 총점 지표도 같은 기준으로 통일
+        if stats.get("avg_total") is not None:
+            avg_total = float(stats["avg_total"])
+            perfect_count = int(stats.get("perfect") or 0)
+            score_scope = "테이블 전체 기준"
+        else:
+            avg_total = float(totals.mean())
+            perfect_count = int(score_counts[3])
+            score_scope = "표시 범위 기준"
+    else:
+        total_count = len(df)
+        unique_students = df["student_id"].nunique() if "student_id" in df.columns else 0
+        latest_time = df["created_at"].max() if "created_at" in df.columns else None
+        # 문항별 정답(O) 비율 — 위에서 만든 행렬을 재사용
+        r1, r2, r3 = score_matrix.mean(axis=0) * 100.0
+        avg_total = float(totals.mean())
+        perfect_count = int(score_counts[3])
+        rate_scope = score_scope = "표시 범위 기준"
 
     c1, c2, c3 = st.columns(3)
-    c1.metric("총 제출 수", f"{len(df)}")
+    c1.metric("총 제출 수", f"{total_count}")
     c2.metric("고유 학생 수", f"{unique_students}")
-    c3.metric("최신 제출", f"{latest_time}" if latest_time is not None else "-")
-
-    # 문항별 정답(O) 비율 (feedback_i가 "O:"로 시작하는 비율)
-    def o_rate(series: pd.Series) -> float:
-        if series is None or series.empty:
-            return 0.0
-        s = series.fillna("").astype(str)
-        return (s.str.startswith("O:").sum() / len(s)) * 100.0
+    # 포맷팅은 표시되는 이 한 값에 대해서만 수행
+    c3.metric(
+        "최신 제출",
+        latest_time.strftime("%Y-%m-%d %H:%M:%S") if pd.notna(latest_time) else "-",
+    )
 
-    r1 = o_rate(df.get("feedback_1"))
-    r2 = o_rate(df.get("feedback_2"))
-    r3 = o_rate(df.get("feedback_3"))
+    # 총점 관련 지표 — 집계 출처(RPC/행 기반)에 따라 기준을 표기
+    t1, t2 = st.columns(2)
+    t1.metric(f"평균 총점 ({score_scope})", f"{avg_total:.2f} / 3")
+    t2.metric(f"만점(3점) 수 ({score_scope})", f"{perfect_count}")
 
-    st.markdown("#### ✅ 문항별 O 비율(전체 표시 범위 기준)")
+    st.markdown(f"#### ✅ 문항별 O 비율({rate_scope})")
     s1, s2, s3 = st.columns(3)
     s1.metric("문항 1", f"{r1:.1f}%")
     s2.metric("문항 2", f"{r2:.1f}%")
     s3.metric("문항 3", f"{r3:.1f}%")
 
+    # 차트: 캐시 키가 되도록 작은 튜플로 변환해 전달
+    ch1, ch2 = st.columns(2)
+    with ch1:
+        st.plotly_chart(
+            build_accuracy_bar((round(r1, 1), round(r2, 1), round(r3, 1)), rate_scope),
+            use_container_width=True,
+        )
+    with ch2:
+        st.plotly_chart(
+            build_score_pie(tuple(enumerate(score_counts.tolist()))),
+            use_container_width=True,
+        )
+
     # =========================================================
     # 5) 전체 목록 표시 + CSV 다운로드
     # =========================================================
@@ -161,12 +495,26 @@ else:
         "student_id", "created_at",
         "answer_1", "answer_2", "answer_3",
         "feedback_1", "feedback_2", "feedback_3",
-        "model"
+        "총점", "model"
     ]
     show_cols = [c for c in show_cols if c in df.columns]
-    st.dataframe(df[show_cols], use_container_width=True, hide_index=True)
+    # 화면에는 최신 200건만 직렬화 (fetch가 최신순 정렬이므로 head로 충분)
+    DISPLAY_ROWS = 200
+    st.dataframe(
+        df[show_cols].head(DISPLAY_ROWS),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "created_at": st.column_config.DatetimeColumn(
+                "제출시간", format="YYYY-MM-DD HH:mm:ss"
+            )
+        },
+    )
+
+    if len(df) > DISPLAY_ROWS:
+        st.caption(f"최신 {DISPLAY_ROWS}건만 표시 중 — 전체 {len(df)}건은 CSV로 받으세요.")
 
-    csv = df[show_cols].to_csv(index=False).encode("utf-8-sig")
+    csv = to_csv_bytes(df[show_cols])
     st.download_button(
         "📥 CSV 다운로드",
         csv,
@@ -179,24 +527,4 @@ else:
     # =========================================================
     st.markdown("---")
     st.subheader("🔎 개인별 피드백 조회")
-
-    # 현재 필터 범위 내 학생 목록에서 선택(원하면 직접 입력으로 바꿔도 됨)
-    student_list = sorted(df["student_id"].dropna().astype(str).unique().tolist())
-    selected = st.selectbox("학번 선택", options=student_list)
-
-    if selected:
-        history = fetch_student_history(selected, limit=200)
-        st.write(f"**{selected} 제출 이력: {len(history)}건**")
-
-        if history.empty:
-            st.info("이 학번의 이력이 없습니다.")
-        else:
-            hist_cols = [
-                "created_at",
-                "answer_1", "feedback_1",
-                "answer_2", "feedback_2",
-                "answer_3", "feedback_3",
-                "model",
-            ]
-            hist_cols = [c for c in hist_cols if c in history.columns]
-            st.dataframe(history[hist_cols], use_container_width=True, hide_index=True)
+    render_student_detail(df)